@@ -1,7 +1,8 @@
-import os, datetime as dt, random
+import os, io, csv, shutil, tempfile, importlib.util, datetime as dt, random
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
 
 
 AUTO_PCTS = {
@@ -20,21 +21,22 @@ AUTO_PCTS = {
     "Fun/Joys/Travel": 5
     # Remaining categories get proportionally allocated
 }
+_auto_total = sum(AUTO_PCTS.values())
+AUTO_PCTS_NORMALIZED = {k: v * 100.0 / _auto_total for k, v in AUTO_PCTS.items()}  # sums to 100
 # ---------------------------------------
 # GOOGLE SHEETS SUPPORT
 # ---------------------------------------
 #USE_SHEETS_DEFAULT = False  # Default checked value
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
-# Try loading Google Sheets libraries
-_gs_ok = True
+# Google Sheets libraries are imported on first use; only probe for them here
 try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-except Exception:
+    _gs_ok = all(importlib.util.find_spec(m) is not None for m in ("gspread", "google.oauth2"))
+except ImportError:  # parent package "google" itself is missing
     _gs_ok = False
 
 
+@st.cache_resource(show_spinner=False)
 def get_gspread_client_from_secrets():
     """Authenticate using Streamlit secrets (service account)."""
     if not _gs_ok:
@@ -43,10 +45,46 @@ def get_gspread_client_from_secrets():
     if "gcp_service_account" not in st.secrets:
         raise RuntimeError("Missing 'gcp_service_account' in Streamlit secrets.")
 
+    import gspread
+    from google.oauth2.service_account import Credentials
     creds = Credentials.from_service_account_info(
         st.secrets["gcp_service_account"], scopes=SCOPES
     )
-    return gspread.authorize(creds)
+    # BackOffHTTPClient retries 429/5xx with exponential backoff
+    return gspread.authorize(creds, http_client=gspread.BackOffHTTPClient)
+
+@st.cache_resource(show_spinner=False)
+def open_spreadsheet(sheet_id):
+    """Spreadsheet handle for `sheet_id`, opened once instead of on every rerun."""
+    return get_gspread_client_from_secrets().open_by_key(sheet_id)
+
+def get_or_create_worksheet(spreadsheet, title):
+    """Return (worksheet, created) for `title`, adding the tab if it is missing."""
+    import gspread
+    try:
+        return spreadsheet.worksheet(title), False
+    except gspread.WorksheetNotFound:
+        return spreadsheet.add_worksheet(title=title, rows=100, cols=10), True
+
+@st.cache_resource(show_spinner=False)
+def _sheet_tabs(sheet_id):
+    """Per-spreadsheet {title: {"ws": worksheet, "shape": (rows, cols) | None}} kept in
+    memory, so repeat saves skip the worksheet lookup; "shape" is what we last wrote."""
+    return {}
+
+def save_df_to_sheet(df, worksheet, prev_shape=None):
+    """Replace a worksheet's contents with `df` in one values update; returns the written shape.
+    Cells beyond `df` up to `prev_shape` are blanked in the same call (cleared first if unknown)."""
+    values = [df.columns.tolist()] + df.astype(object).where(df.notna(), "").astype(str).values.tolist()
+    shape = (len(values), len(values[0]))
+    if prev_shape is None:
+        worksheet.clear()
+    else:
+        width = max(shape[1], prev_shape[1])
+        values = ([r + [""] * (width - len(r)) for r in values]
+                  + [[""] * width for _ in range(prev_shape[0] - shape[0])])
+    worksheet.update(range_name="A1", values=values, value_input_option="USER_ENTERED")
+    return shape
 
 # ---------------------------
 # CONFIG
@@ -79,58 +117,324 @@ CATEGORIES_DEFAULT = [
     "Clothing/Personal", "Subscriptions/Misc", "Continued Education", "Fun/Joys/Travel"
 ]
 ACCOUNTS = ["Personal", "Operations", "Business"]
+# 10–10–70 stewardship buckets; every other category counts as living
+GIVE_CATS = pd.Index(["Tithe", "Giving"])
+SAVE_CATS = pd.Index(["Savings (Emergency)", "Investing"])
+
+def _bucket_ids(cats):
+    """Stewardship bucket per category name: 0 = give, 1 = save, 2 = live (everything else)."""
+    return np.where(cats.isin(GIVE_CATS), 0, np.where(cats.isin(SAVE_CATS), 1, 2)).astype(np.intp)
+
+# Buckets for the default vocabulary, which category_dtype always puts first
+_DEFAULT_CATS = pd.Index(CATEGORIES_DEFAULT)
+_DEFAULT_BUCKETS = _bucket_ids(_DEFAULT_CATS)
 
 # ---------------------------
 # UTILITIES
 # ---------------------------
-def load_or_create_csv(path, columns):
-    if not os.path.exists(path):
+# Stat memos. Streamlit re-executes this script in a fresh module on every rerun,
+# so these caches live for one run; writes below clear them early.
+@lru_cache(maxsize=64)
+def _exists(path): return os.path.exists(path)
+
+@lru_cache(maxsize=64)
+def _mtime(path): return os.path.getmtime(path)
+
+def _clear_stat_cache():
+    _exists.cache_clear()
+    _mtime.cache_clear()
+
+def _coerce_numeric(df, cols):
+    """`df[cols]` as float64, with blanks and unparseable cells ("$12") as 0.0."""
+    return df[list(cols)].apply(pd.to_numeric, errors="coerce").astype(float).fillna(0.0)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_csv_cached(path, mtime, dtypes=None):
+    """Parse a CSV once per (path, mtime) with the pyarrow reader when available.
+    Columns in `dtypes` are typed by the parser and come back with NaN as 0."""
+    try:
+        try:
+            df = pd.read_csv(path, dtype=dtypes, engine="pyarrow")
+        except ImportError:
+            df = pd.read_csv(path, dtype=dtypes)
+    except ValueError:
+        # a hand-edited cell such as "$12" fails the typed parse; coerce instead
+        df = pd.read_csv(path)
+        typed = [c for c in dtypes or () if c in df.columns]
+        df[typed] = _coerce_numeric(df, typed)
+    for c in dtypes or ():
+        if c in df.columns: df[c] = df[c].fillna(0.0)
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_parquet_cached(path, mtime):
+    """Load a Parquet file once per (path, mtime); dtypes come back as written."""
+    return pd.read_parquet(path, engine="pyarrow")
+
+def load_or_create_csv(path, columns, dtypes=None, mtime=None):
+    if not _exists(path):
         pd.DataFrame(columns=columns).to_csv(path, index=False)
-    return pd.read_csv(path)
+        _clear_stat_cache()
+    return _read_csv_cached(path, mtime or _mtime(path), dtypes)
+
+def _invalidate_caches(path, old_mtime):
+    """Called after writing `path`: drop every read cache if its mtime didn't move."""
+    _clear_stat_cache()
+    if _file_mtime(path) != old_mtime:
+        return
+    _read_csv_cached.clear()
+    _read_parquet_cached.clear()
+    _load_account_frames.clear()
+    build_insights.clear()
+    insight_totals.clear()
+    for k in [k for k in st.session_state if str(k).startswith("_frame:")]:
+        del st.session_state[k]
+
+def _mirror_to_sheet(path, df=None, rows=None):
+    """Best-effort copy of a local write to the connected Google Sheet (one tab per file).
+    Pass `df` to replace the tab, or `rows` to append them in one call."""
+    if not (use_sheets and sh is not None):
+        return
+    try:
+        tabs, title = _sheet_tabs(sh.id), os.path.splitext(os.path.basename(path))[0]
+        if title not in tabs:
+            ws, created = get_or_create_worksheet(sh, title)
+            tabs[title] = {"ws": ws, "shape": (0, 0) if created else None}
+        tab = tabs[title]
+        if rows is not None and tab["shape"] != (0, 0):
+            tab["ws"].append_rows(rows, value_input_option="USER_ENTERED")
+            if tab["shape"] is not None:
+                tab["shape"] = (tab["shape"][0] + len(rows), max(tab["shape"][1], len(rows[0])))
+        else:
+            tab["shape"] = save_df_to_sheet(df if df is not None else pd.read_csv(path),
+                                            tab["ws"], tab["shape"])
+    except Exception as e:
+        st.warning(f"Google Sheets sync failed: {e}")
+
+def _write_csv(df, path):
+    """Write `df` with pyarrow's C++ CSV writer when every column is numeric or datetime,
+    else with pandas (pyarrow quotes every string field, so text frames keep one layout)."""
+    if all(t.kind in "biufM" for t in df.dtypes):
+        try:
+            import pyarrow as pa, pyarrow.csv as pacsv
+        except ImportError:
+            pa = None
+        if pa is not None:
+            try:
+                pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+                return
+            except pa.ArrowException:   # unsupported type: fall through to pandas
+                pass
+    df.to_csv(path, index=False)
+
+@st.cache_resource(show_spinner=False)
+def _umask():
+    """Process umask, read once (os.umask can only be read by setting it)."""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
 
 def save_df(df, path):
-    df.to_csv(path, index=False)
+    """Rewrite `path` atomically: write a unique sibling temp file, then os.replace it in."""
+    old_mtime = _file_mtime(path)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        if path.endswith(".parquet"):
+            df.to_parquet(tmp, engine="pyarrow", compression="zstd", index=False)
+        else:
+            _write_csv(df, tmp)
+        # mkstemp makes the file 0600; keep the target's mode (or the umask default)
+        if os.path.exists(path): shutil.copymode(path, tmp)
+        else: os.chmod(tmp, 0o666 & ~_umask())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp): os.unlink(tmp)   # write failed before the replace
+    _invalidate_caches(path, old_mtime)
+    _mirror_to_sheet(path, df=df)
+
+def _append_row_csv(path, row, header, dtypes=None):
+    """Append one record (a dict) following the file's header (`header` for a new file),
+    and extend this session's in-memory copy (see _session_frame) when it is current."""
+    old_mtime = _file_mtime(path)
+    is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+    cols, lead = header, ""
+    if not is_new:
+        with open(path, "rb") as f:
+            cols = next(csv.reader([f.readline().decode("utf-8-sig")]))
+            f.seek(-1, os.SEEK_END)
+            lead = "" if f.read(1) == b"\n" else "\n"   # hand-edited file without final newline
+    buf = io.StringIO()
+    buf.write(lead)
+    w = csv.writer(buf, lineterminator="\n")
+    if is_new: w.writerow(cols)
+    values = [row.get(c, "") for c in cols]
+    w.writerow(values)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        start = f.tell()
+        f.write(buf.getvalue())
+        f.flush()
+        end, after = f.tell(), os.fstat(f.fileno())
+    _invalidate_caches(path, old_mtime)
+
+    # Extend the session copy only if the file is exactly that copy plus this write;
+    # otherwise another session appended in between and the copy is stale
+    key = f"_frame:{path}"
+    hit = st.session_state.get(key)
+    if (hit is not None and hit[2] == start and after.st_size == end
+            and list(hit[1].columns) == cols):
+        base, added = hit[1], pd.DataFrame([values], columns=cols)
+        typed = [c for c in dtypes or () if c in added.columns]
+        added[typed] = _coerce_numeric(added, typed)
+        for c in base.select_dtypes("category"):   # same dtype on both sides, or concat gives object
+            dtype = pd.CategoricalDtype(list(dict.fromkeys([*base[c].cat.categories, *added[c].dropna()])))
+            base[c], added[c] = base[c].astype(dtype), added[c].astype(dtype)
+        st.session_state[key] = (after.st_mtime, pd.concat([base, added], ignore_index=True), end)
+    else:
+        st.session_state.pop(key, None)
+    _mirror_to_sheet(path, rows=[values])
+
+SPEND_DTYPES = {"Amount": float}
+BUDGET_DTYPES = {c: float for c in ["Check1","Check2","Check3","Check4","Monthly_Total"]}
 
 def csv_budget_path(account): return os.path.join(DATA_DIR, f"{account.lower()}_budgets.csv")
 def csv_spend_path(account):  return os.path.join(DATA_DIR, f"{account.lower()}_spending.csv")
+def parquet_budget_path(account): return os.path.join(DATA_DIR, f"{account.lower()}_budgets.parquet")
+
+def load_or_create_budget(account, mtime=None):
+    """Budget frame for `account`, stored as Parquet; a legacy CSV is converted on first use."""
+    path = parquet_budget_path(account)
+    if not _exists(path):
+        legacy = csv_budget_path(account)
+        if _exists(legacy):
+            df = _read_csv_cached(legacy, _mtime(legacy), BUDGET_DTYPES)
+        else:
+            df = pd.DataFrame(columns=["Category", *BUDGET_DTYPES]).astype(BUDGET_DTYPES)
+        save_df(df, path)
+    return _read_parquet_cached(path, mtime or _mtime(path))
+
+def category_dtype(*columns):
+    """Categorical dtype over CATEGORIES_DEFAULT plus any extra names found in `columns`."""
+    extra = [c for col in columns for c in col.dropna().unique()]
+    return pd.CategoricalDtype(list(dict.fromkeys([*CATEGORIES_DEFAULT, *extra])))
+
+def with_category_codes(df):
+    """Cast `Category` to category_dtype in place and return `df`."""
+    df["Category"] = df["Category"].astype(category_dtype(df["Category"]))
+    return df
 
 def ensure_budget_schema(df):
     cols = ["Category","Check1","Check2","Check3","Check4","Monthly_Total"]
-    for c in cols:
-        if c not in df.columns: df[c] = 0.0
-    df["Monthly_Total"] = df[["Check1","Check2","Check3","Check4"]].fillna(0).sum(axis=1)
-    return df[cols]
+    checks = cols[1:5]
+    # Frames from load_or_create_budget already match: skip the re-slice copy and the cast
+    if (list(df.columns) != cols or not isinstance(df["Category"].dtype, pd.CategoricalDtype)
+            or not all(pd.api.types.is_numeric_dtype(df[c]) for c in checks)):
+        for c in cols:
+            if c not in df.columns: df[c] = 0.0
+        df[checks] = _coerce_numeric(df, checks)
+        df = with_category_codes(df)[cols]
+    df["Monthly_Total"] = df[checks].to_numpy(dtype=np.float64, na_value=0.0).sum(axis=1)
+    return df
+
+def _file_mtime(path):
+    return _mtime(path) if _exists(path) else 0.0
+
+def _session_frame(path, load):
+    """Per-session memo of `load(mtime)`, re-run when the file's mtime moves; returns a copy.
+    Stored as (mtime, df, size) from one stat, and `load` parses for that same mtime."""
+    key = f"_frame:{path}"
+    try:
+        stat = os.stat(path)
+        mt, size = stat.st_mtime, stat.st_size
+    except FileNotFoundError:
+        mt, size = 0.0, 0
+    hit = st.session_state.get(key)
+    if hit is None or hit[0] != mt or not mt:
+        hit = st.session_state[key] = (mt, load(mt or None), size)
+    return hit[1].copy()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _load_account_frames(acc, budget_mtime, spend_mtime):
+    """Cleaned (budget_df, spending_df, total budget, total spent) for one account.
+    The mtimes only key the cache so a changed file triggers a fresh load."""
+    bdf = ensure_budget_schema(load_or_create_budget(acc))
+    sdf = with_category_codes(load_or_create_csv(
+        csv_spend_path(acc), ["Date","Category","Amount","Memo"], SPEND_DTYPES))
+    # The app writes str(date); an explicit ISO format keeps every row on the fast
+    # parser instead of guessing from the first value
+    sdf["Date"] = pd.to_datetime(sdf["Date"], format="ISO8601", errors="coerce", cache=True)
+    return bdf, sdf, bdf["Monthly_Total"].sum(), sdf["Amount"].sum()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_insights(sig):
+    """All-account data for Tab 2 as (combined spending, per-account summary).
+    `sig` is a tuple of (account, budget_mtime, spend_mtime) triples."""
+    frames, owners, summary = [], [], []
+    for acc, budget_mtime, spend_mtime in sig:
+        _, sdf, tot_b, tot_s = _load_account_frames(acc, budget_mtime, spend_mtime)
+        summary.append({"Account":acc,"Total Budget":tot_b,"Total Spent":tot_s,"Remaining":tot_b-tot_s})
+        if not sdf.empty:
+            frames.append(sdf)
+            owners.append(ACCOUNTS.index(acc))
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+        # Account codes built once for the concatenated frame: no per-frame assign() copy
+        combined["Account"] = pd.Categorical.from_codes(
+            np.repeat(owners, [len(f) for f in frames]), categories=ACCOUNTS)
+        # "October 2025" labels: strftime runs once per distinct month, not per row
+        combined["Month"] = (combined["Date"].dt.to_period("M").astype("category")
+                             .cat.rename_categories(lambda p: p.strftime("%B %Y")))
+    else:
+        combined = pd.DataFrame(columns=["Date","Category","Amount","Memo","Account","Month"])
+    # Per-account vocabularies differ, so concat falls back to object; re-unify
+    combined["Category"] = combined["Category"].astype(category_dtype(combined["Category"]))
+    return combined, pd.DataFrame(summary, columns=["Account","Total Budget","Total Spent","Remaining"])
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def insight_totals(sig, months=None):
+    """Tab 2 aggregates for the selected `months` (None = all rows) as
+    (row count, (give, save, live), per-category totals, per-(Month, Account) totals)."""
+    combined, _ = build_insights(sig)
+    if months is not None:
+        combined = combined[combined["Month"].isin(months)]
+    by_cat = combined.groupby("Category", observed=True)["Amount"].sum().reset_index()
+    trend = combined.groupby(["Month","Account"], observed=True)["Amount"].sum().reset_index()
+    return len(combined), stewardship_split(combined["Category"], combined["Amount"]), by_cat, trend
+
+DASH_PATH = os.path.join(DATA_DIR, "dashboard_data.csv")
+
+def _load_dash_dict():
+    """Read dashboard_data.csv once into a {Key: Value} dict."""
+    df = load_or_create_csv(DASH_PATH, ["Key","Value"]).drop_duplicates("Key")  # first row wins, as before
+    return dict(zip(df["Key"], df["Value"]))
+
+def _save_dash_dict(d):
+    """Write the whole {Key: Value} dict back in a single pass."""
+    save_df(pd.DataFrame(list(d.items()), columns=["Key","Value"]), DASH_PATH)
+
+def _update_dash(updates):
+    """Upsert several dashboard keys with one read and one write."""
+    d = _load_dash_dict()
+    d.update(updates)
+    _save_dash_dict(d)
 
 def load_income(account):
-    dash_path = os.path.join(DATA_DIR,"dashboard_data.csv")
-    if not os.path.exists(dash_path): return [0,0,0,0]
-    df = pd.read_csv(dash_path)
-    vals=[]
-    for i in range(1,5):
-        key=f"{account}_Check{i}_Income"
-        vals.append(float(df.loc[df["Key"]==key,"Value"].iloc[0]) if key in df["Key"].values else 0)
-    return vals
+    d = _load_dash_dict()
+    return [float(d.get(f"{account}_Check{i}_Income", 0)) for i in range(1,5)]
 
 def save_income(account,checks):
-    dash_path=os.path.join(DATA_DIR,"dashboard_data.csv")
-    df=load_or_create_csv(dash_path,["Key","Value"])
-    for i,v in enumerate(checks,1):
-        key=f"{account}_Check{i}_Income"
-        if key in df["Key"].values: df.loc[df["Key"]==key,"Value"]=v
-        else: df.loc[len(df)] = [key,v]
-    total=sum(checks)
-    key=f"{account}_Total_Income"
-    if key in df["Key"].values: df.loc[df["Key"]==key,"Value"]=total
-    else: df.loc[len(df)] = [key,total]
-    save_df(df,dash_path)
+    updates = {f"{account}_Check{i}_Income": v for i,v in enumerate(checks,1)}
+    updates[f"{account}_Total_Income"] = sum(checks)
+    _update_dash(updates)
 
+@st.fragment
 def show_scripture():
-    verse_idx = st.session_state.get("verse_idx",0)
-    ref,text = SCRIPTURE[verse_idx]
-    st.markdown(f"### ✝️ “{text}”  \n*— {ref}*")
-    if st.button("Next Verse 🔁", key=f"next_verse_{verse_idx}"):
-        st.session_state["verse_idx"] = (verse_idx + 1) % len(SCRIPTURE)
-        st.experimental_rerun()
+    # A fragment: clicking "Next Verse" reruns only this function, not the whole app
+    placeholder = st.empty()
+    if st.button("Next Verse 🔁", key="next_verse"):
+        st.session_state["verse_idx"] = (st.session_state.get("verse_idx",0) + 1) % len(SCRIPTURE)
+    ref,text = SCRIPTURE[st.session_state.get("verse_idx",0)]
+    placeholder.markdown(f"### ✝️ “{text}”  \n*— {ref}*")
 
 # Default setting for Google Sheets toggle
 USE_SHEETS_DEFAULT = False
@@ -152,8 +456,7 @@ with st.sidebar:
 
         if sheet_id:
             try:
-                client = get_gspread_client_from_secrets()
-                sh = client.open_by_key(sheet_id)
+                sh = open_spreadsheet(sheet_id)
                 st.success("Connected to Google Sheet.")
             except Exception as e:
                 st.error(f"Google Sheets error: {e}")
@@ -163,6 +466,10 @@ with st.sidebar:
 
 #--Auto-reduce budgets per category when vacancy mode is ON---#
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def _generate_auto_budget_cached(check_amount, pcts, total_pct):
+    return tuple(round(check_amount * (pct / total_pct), 2) for pct in pcts)
+
 def generate_auto_budget(check_amount, category_allocations, vacancy_mode=False, vacancy_pct=0):
     """
     Automatically allocates a check amount according to percentages.
@@ -181,22 +488,22 @@ def generate_auto_budget(check_amount, category_allocations, vacancy_mode=False,
     if total_pct <= 0:
         return {cat: 0 for cat in category_allocations}
 
-    # --- Compute safe allocations ---
-    return {
-        cat: round(check_amount * (pct / total_pct), 2)
-        for cat, pct in category_allocations.items()
-    }
+    # --- Compute safe allocations (keyed on the percents only, in insertion order) ---
+    alloc = _generate_auto_budget_cached(
+        check_amount, tuple(category_allocations.values()), total_pct)
+    return dict(zip(category_allocations, alloc))
 
 def apply_vacancy_to_budget(budget_df, vacancy_pct):
     """Returns a copy of the budget with Monthly_Total reduced by vacancy %."""
     adj_factor = (100 - vacancy_pct) / 100
     adj_df = budget_df.copy()
+    cols = ["Check1", "Check2", "Check3", "Check4"]
 
-    for col in ["Check1", "Check2", "Check3", "Check4"]:
-        if col in adj_df.columns:
-            adj_df[col] = pd.to_numeric(adj_df[col], errors="coerce").fillna(0) * adj_factor
-
-    adj_df["Monthly_Total"] = adj_df[["Check1", "Check2", "Check3", "Check4"]].sum(axis=1)
+    # One coercion + one multiply over the whole (n, 4) block
+    mat = _coerce_numeric(adj_df.reindex(columns=cols), cols).to_numpy()
+    mat *= adj_factor
+    adj_df[cols] = mat
+    adj_df["Monthly_Total"] = mat.sum(axis=1)
 
     return adj_df
 
@@ -207,38 +514,70 @@ def auto_fill_budget(df, check_inputs, auto_pct_map, vacancy_mode=False, vacancy
     - check_inputs: [c1, c2, c3, c4] numeric
     - auto_pct_map: {"Tithe": 10, "Savings (Emergency)": 5, ...}  (percents)
     """
-    # Normalize map to only categories in df, defaulting missing to 0
     cats = list(df["Category"])
-    pct_map = {c: float(auto_pct_map.get(c, 0)) for c in cats}
+    if ({c: p for c, p in auto_pct_map.items() if p} == AUTO_PCTS
+            and AUTO_PCTS.keys() <= set(cats)):
+        # Untouched defaults (extra 0% rows aside): the normalized map is already known
+        pct_map = AUTO_PCTS_NORMALIZED
+    else:
+        # Normalize map to only categories in df, defaulting missing to 0
+        pct_map = {c: float(auto_pct_map.get(c, 0)) for c in cats}
 
-    # If total is 0, just set everything to 0 safely
-    total_pct = sum(pct_map.values())
-    if total_pct <= 0:
-        for col in ["Check1","Check2","Check3","Check4"]:
-            df[col] = 0.0
-        df["Monthly_Total"] = 0.0
-        return df
+        # If total is 0, just set everything to 0 safely
+        total_pct = sum(pct_map.values())
+        if total_pct <= 0:
+            for col in ["Check1","Check2","Check3","Check4"]:
+                df[col] = 0.0
+            df["Monthly_Total"] = 0.0
+            return df
 
-    # Normalize to 100% to avoid surprises
-    scale = 100.0 / total_pct
-    pct_map = {c: p * scale for c, p in pct_map.items()}
+        # Normalize to 100% to avoid surprises
+        scale = 100.0 / total_pct
+        pct_map = {c: p * scale for c, p in pct_map.items()}
 
     adj = (100 - vacancy_pct) / 100.0 if vacancy_mode else 1.0
 
-    # Allocate for each category and check
-    for idx, row in df.iterrows():
-        cat = row["Category"]
-        pct = pct_map.get(cat, 0.0) / 100.0
-        df.at[idx, "Check1"] = check_inputs[0] * pct * adj
-        df.at[idx, "Check2"] = check_inputs[1] * pct * adj
-        df.at[idx, "Check3"] = check_inputs[2] * pct * adj
-        df.at[idx, "Check4"] = check_inputs[3] * pct * adj
-
-    df["Monthly_Total"] = df[["Check1","Check2","Check3","Check4"]].sum(axis=1)
+    # Allocate every category x check in one outer product
+    pcts = np.asarray([pct_map.get(c, 0.0) for c in cats], dtype=float) / 100.0
+    mat = np.outer(pcts, np.asarray(check_inputs, dtype=float) * adj)
+    df[["Check1","Check2","Check3","Check4"]] = mat
+    df["Monthly_Total"] = mat.sum(axis=1)
     return df
 
 
 
+def stewardship_split(category, amount):
+    """(give, save, live) totals for a categorical Category; uncategorized rows are skipped."""
+    cats = category.cat.categories
+    n = len(_DEFAULT_CATS)
+    if cats[:n].equals(_DEFAULT_CATS):   # only the custom names need classifying
+        lut = np.concatenate([_DEFAULT_BUCKETS, _bucket_ids(cats[n:])])
+    else:
+        lut = _bucket_ids(cats)
+    codes = category.cat.codes.to_numpy()
+    known = codes >= 0
+    return np.bincount(lut[codes[known]], weights=amount.to_numpy(dtype=float)[known], minlength=3)
+
+# ---------------------------
+# CHARTS (cached on input data)
+# ---------------------------
+@st.cache_data(show_spinner=False, max_entries=32)
+def _budget_vs_actual_fig(summary_df):
+    import plotly.express as px  # deferred: only Tab 2 draws charts
+    return px.bar(summary_df.melt(id_vars="Account",value_vars=["Total Budget","Total Spent"]),
+                  x="Account",y="value",color="variable",barmode="group")
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _spending_pie_fig(by_cat):
+    import plotly.express as px
+    return px.pie(by_cat,names="Category",values="Amount",hole=0.4)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _monthly_trend_fig(trend):
+    import plotly.express as px
+    return px.bar(trend,x="Month",y="Amount",color="Account",barmode="group")
+
+
 
 # ---------------------------
 # MAIN APP
@@ -254,26 +593,23 @@ tab1, tab2 = st.tabs(["💼 Accounts","📈 Insights"])
 # ==========================================================
 with tab1:
     account = st.selectbox("Select Account", ACCOUNTS, key="acct_select")
-    budget_path, spend_path = csv_budget_path(account), csv_spend_path(account)
+    budget_path, spend_path = parquet_budget_path(account), csv_spend_path(account)
 
-    # Load data once
-    budget_df = load_or_create_csv(
-        budget_path,
-        ["Category","Check1","Check2","Check3","Check4","Monthly_Total"]
-    )
-    budget_df = ensure_budget_schema(budget_df)
+    # Load data once (Parquet keeps the budget check columns typed as float)
+    budget_df = ensure_budget_schema(
+        _session_frame(budget_path, lambda mt: load_or_create_budget(account, mt)))
 
-    spending_df = load_or_create_csv(
+    spending_df = _session_frame(spend_path, lambda mt: with_category_codes(load_or_create_csv(
         spend_path,
-        ["Date","Category","Amount","Memo"]
-    )
+        ["Date","Category","Amount","Memo"],
+        SPEND_DTYPES,   # Amount parsed as float once, inside the cached read
+        mtime=mt,
+    )))
 
-    # Convert numeric cols once
-    for c in ["Check1","Check2","Check3","Check4","Monthly_Total"]:
-        if c in budget_df.columns:
-            budget_df[c] = pd.to_numeric(budget_df[c], errors="coerce").fillna(0.0)
-    if "Amount" in spending_df.columns:
-        spending_df["Amount"] = pd.to_numeric(spending_df["Amount"], errors="coerce").fillna(0.0)
+    # Categories = this budget's rows, so groupby(observed=False) is already aligned.
+    # The session frame is already categorical: this only remaps codes, no string hashing.
+    budget_cats = tuple(dict.fromkeys(budget_df["Category"].dropna()))  # also the Add form's options
+    spending_df["Category"] = spending_df["Category"].astype(pd.CategoricalDtype(budget_cats))
 
     # ✅ Header appears only once (was inside a loop before)
     st.subheader(f"{account} Overview")
@@ -311,14 +647,13 @@ with tab1:
     # VACANCY TOGGLE
     # ----------------------------
     st.markdown("### 🏠 Vacancy Adjustment Mode")
-    dash_path = os.path.join(DATA_DIR, "dashboard_data.csv")
-    dash_df   = load_or_create_csv(dash_path, ["Key","Value"])
+    dash = _load_dash_dict()
 
     vac_key      = f"{account}_Vacancy_Mode"
     vac_pct_key  = f"{account}_Vacancy_Pct"
 
-    saved_mode = dash_df.loc[dash_df["Key"] == vac_key, "Value"].iloc[0] if vac_key in dash_df["Key"].values else "False"
-    saved_pct  = float(dash_df.loc[dash_df["Key"] == vac_pct_key, "Value"].iloc[0]) if vac_pct_key in dash_df["Key"].values else float(DEFAULT_VACANCY_REDUCTION)
+    saved_mode = str(dash.get(vac_key, "False"))
+    saved_pct  = float(dash.get(vac_pct_key, DEFAULT_VACANCY_REDUCTION))
 
     vacancy_mode = st.checkbox("Enable Vacancy (temporary income reduction)",
                                value=(saved_mode == "True"),
@@ -334,17 +669,11 @@ with tab1:
 
     if st.button("💾 Save Vacancy Settings", key=f"save_vacancy_{account}"):
         # Persist settings
-        dash_df = load_or_create_csv(dash_path, ["Key","Value"])
-        for k, v in {
+        _update_dash({
             vac_key: str(vacancy_mode),
             vac_pct_key: float(vacancy_pct),
             f"{account}_Adjusted_Income": float(adj_income),
-        }.items():
-            if k in dash_df["Key"].values:
-                dash_df.loc[dash_df["Key"] == k, "Value"] = v
-            else:
-                dash_df.loc[len(dash_df)] = [k, v]
-        save_df(dash_df, dash_path)
+        })
 
         # Also apply the reduction to the *current saved* budget and persist
         if vacancy_mode:
@@ -398,9 +727,10 @@ with tab1:
             key=f"edit_{account}"
         )
         # Apply edits and recompute total
-        for c in ["Check1","Check2","Check3","Check4"]:
-            budget_df[c] = pd.to_numeric(edit[c], errors="coerce").fillna(0.0)
-        budget_df["Monthly_Total"] = budget_df[["Check1","Check2","Check3","Check4"]].sum(axis=1)
+        check_cols = ["Check1","Check2","Check3","Check4"]
+        budget_df[check_cols] = edit[check_cols].astype(float).fillna(0.0)  # editor keeps the float dtype
+        # rows deleted in the editor align to NaN here; count them as 0 like ensure_budget_schema
+        budget_df["Monthly_Total"] = budget_df[check_cols].to_numpy(dtype=float, na_value=0.0).sum(axis=1)
 
         st.dataframe(budget_df[["Category","Monthly_Total"]], use_container_width=True, height=260)
 
@@ -411,9 +741,7 @@ with tab1:
 
     with colB:
         st.write("### Actual Spending (to date)")
-        totals = (spending_df.groupby("Category")["Amount"].sum()
-                  .reindex(budget_df["Category"], fill_value=0)
-                  .reset_index())
+        totals = spending_df.groupby("Category", observed=False)["Amount"].sum().reset_index()
         st.dataframe(totals, use_container_width=True)
 
     # ----------------------------
@@ -424,14 +752,16 @@ with tab1:
     with st.form(f"addtxn_{account}", clear_on_submit=True):
         c1, c2, c3, c4 = st.columns(4)
         date = c1.date_input("Date", dt.date.today())
-        cat  = c2.selectbox("Category", budget_df["Category"])
+        cat  = c2.selectbox("Category", budget_cats)
         amt  = c3.number_input("Amount ($)", 0.0, step=1.0)
         chk  = c4.selectbox("Check #", [1,2,3,4])
         memo = st.text_input("Memo (optional)")
 
         if st.form_submit_button("Add"):
-            spending_df.loc[len(spending_df)] = [str(date), cat, amt, memo]
-            save_df(spending_df, spend_path)
+            _append_row_csv(spend_path,
+                            {"Date": str(date), "Category": cat, "Amount": amt, "Memo": memo,
+                             "Check#": chk, "Account": account},
+                            ["Date","Category","Amount","Memo"], SPEND_DTYPES)
             st.success("Transaction added!")
 
 
@@ -441,35 +771,25 @@ with tab1:
 with tab2:
     st.header("📈 Financial Insights Overview")
 
-    # Combine data
-    combined, summary = pd.DataFrame(), []
-    for acc in ACCOUNTS:
-        b, s = csv_budget_path(acc), csv_spend_path(acc)
-        bdf = ensure_budget_schema(load_or_create_csv(b,["Category","Check1","Check2","Check3","Check4","Monthly_Total"]))
-        sdf = load_or_create_csv(s,["Date","Category","Amount","Memo"])
-        sdf["Amount"]=pd.to_numeric(sdf["Amount"],errors="coerce").fillna(0)
-        tot_b, tot_s = bdf["Monthly_Total"].sum(), sdf["Amount"].sum()
-        summary.append({"Account":acc,"Total Budget":tot_b,"Total Spent":tot_s,"Remaining":tot_b-tot_s})
-        if not sdf.empty:
-            sdf["Account"]=acc; sdf["Date"]=pd.to_datetime(sdf["Date"],errors="coerce")
-            combined=pd.concat([combined,sdf],ignore_index=True)
+    # Combine data (one cached build, keyed on every account's file mtimes)
+    sig = tuple((acc, _file_mtime(parquet_budget_path(acc)), _file_mtime(csv_spend_path(acc)))
+                for acc in ACCOUNTS)
+    combined, summary_df = build_insights(sig)
 
     # Month filter
+    months = None
     if not combined.empty:
-        combined["Month"]=combined["Date"].dt.strftime("%B %Y")
-        all_months=sorted(combined["Month"].dropna().unique(),key=lambda x:pd.to_datetime(x))
-        months=st.multiselect("Select Month(s)",all_months,default=[all_months[-1]])
-        combined=combined[combined["Month"].isin(months)]
+        # Categories come from the sorted monthly periods, so they're already in calendar order
+        all_months=list(combined["Month"].cat.categories)
+        months=tuple(st.multiselect("Select Month(s)",all_months,default=all_months[-1:]))
+    n_rows, split, by_cat, trend = insight_totals(sig, months)
 
     # Stewardship Ratios
     st.subheader("💒 Stewardship Ratios (10–10–70)")
     total_income=sum(st.session_state.get(f"{a}_income",0) for a in ACCOUNTS)
     st.info(f"💵 Combined Adjusted Income: ${total_income:,.2f}")
-    if not combined.empty and total_income>0:
-        tot=combined.groupby("Category")["Amount"].sum().to_dict()
-        give=tot.get("Tithe",0)+tot.get("Giving",0)
-        save_amt=tot.get("Savings (Emergency)",0)+tot.get("Investing",0)
-        live=sum(v for k,v in tot.items() if k not in ["Tithe","Giving","Savings (Emergency)","Investing"])
+    if n_rows and total_income>0:
+        give,save_amt,live=split
         gp,sp,lp=[round(100*x/total_income,1) for x in [give,save_amt,live]]
         c1,c2,c3=st.columns(3)
         c1.metric("🙏 Giving (Goal 10%)",f"{gp}%")
@@ -478,29 +798,24 @@ with tab2:
         st.progress(min(1,(gp+sp+lp)/100),text=f"Giving {gp}% • Saving {sp}% • Living {lp}%")
 
     # Budget vs Actual + Over/Under
-    if summary:
-        df=pd.DataFrame(summary)
+    if not summary_df.empty:
+        df=summary_df.copy()
         st.subheader("📊 Budget vs Actual by Account")
-        fig=px.bar(df.melt(id_vars="Account",value_vars=["Total Budget","Total Spent"]),
-                   x="Account",y="value",color="variable",barmode="group")
-        st.plotly_chart(fig,use_container_width=True)
+        st.plotly_chart(_budget_vs_actual_fig(df),use_container_width=True)
         df["Status"]=df["Remaining"].apply(lambda v:"✅ Under" if v>=0 else "⚠️ Over")
         st.dataframe(df,use_container_width=True)
 
     # Spending breakdowns
-    if not combined.empty:
+    if n_rows:
         st.subheader("🍰 Spending Breakdown")
-        pie=px.pie(combined,names="Category",values="Amount",hole=0.4)
-        st.plotly_chart(pie,use_container_width=True)
-        trend=(combined.groupby(["Month","Account"])["Amount"].sum().reset_index())
-        bar=px.bar(trend,x="Month",y="Amount",color="Account",barmode="group")
-        st.plotly_chart(bar,use_container_width=True)
+        st.plotly_chart(_spending_pie_fig(by_cat),use_container_width=True)
+        st.plotly_chart(_monthly_trend_fig(trend),use_container_width=True)
 
     # Monthly Summary
-    if summary:
+    if not summary_df.empty:
         st.subheader("🧾 Monthly Summary (Combined)")
-        total_budget=sum(d["Total Budget"] for d in summary)
-        total_spent=sum(d["Total Spent"] for d in summary)
+        total_budget=summary_df["Total Budget"].sum()
+        total_spent=summary_df["Total Spent"].sum()
         rem=total_budget-total_spent
         c1,c2,c3=st.columns(3)
         c1.metric("Total Budget",f"${total_budget:,.0f}")